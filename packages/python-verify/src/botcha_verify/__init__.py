@@ -1,7 +1,13 @@
 """BOTCHA verification library for server-side JWT token validation."""
 
 from .types import BotchaPayload, VerifyOptions, VerifyResult
-from .verify import verify_botcha_token, extract_bearer_token
+from .verify import (
+    verify_botcha_token,
+    verify_botcha_tokens,
+    extract_bearer_token,
+    clear_verify_cache,
+    has_openssl_sha256,
+)
 
 __version__ = "0.1.0"
 
@@ -10,5 +16,8 @@ __all__ = [
     "VerifyOptions",
     "VerifyResult",
     "verify_botcha_token",
+    "verify_botcha_tokens",
     "extract_bearer_token",
+    "clear_verify_cache",
+    "has_openssl_sha256",
 ]
@@ -1,8 +1,11 @@
 """Django middleware for BOTCHA token verification."""
 
-from typing import Callable, Optional, List
+import json
+import re
+from typing import Callable, Iterable, Optional, List, Pattern
 
 try:
+    from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
     from django.conf import settings
     from django.http import JsonResponse, HttpRequest, HttpResponse
 except ImportError:
@@ -10,10 +13,33 @@ except ImportError:
         "Django is not installed. Install it with: pip install 'botcha-verify[django]'"
     )
 
-from .verify import verify_botcha_token, extract_bearer_token
+from .verify import (
+    _cache_key,
+    _get_cached,
+    _verify,
+    extract_bearer_token,
+    verify_botcha_token,
+)
 from .types import VerifyOptions
 
 
+# Static 401 body for missing/malformed Authorization headers, serialized once
+_MISSING_TOKEN_BODY = json.dumps(
+    {
+        "error": "Missing or invalid Authorization header",
+        "detail": "Expected: Authorization: Bearer <token>",
+    }
+).encode()
+
+
+def _compile_prefixes(prefixes: Iterable[str]) -> Optional[Pattern[str]]:
+    """Compile path prefixes into one regex matching any of them, or None if empty."""
+    prefixes = list(prefixes)
+    if not prefixes:
+        return None
+    return re.compile("|".join(re.escape(prefix) for prefix in prefixes))
+
+
 class BotchaVerifyMiddleware:
     """
     Django middleware for BOTCHA token verification.
@@ -35,8 +61,14 @@ class BotchaVerifyMiddleware:
             if hasattr(request, 'botcha'):
                 print(f"Solved in {request.botcha.solve_time}ms")
             return JsonResponse({"data": "protected"})
+
+    Works under both WSGI and ASGI: with an async middleware chain Django
+    calls the native async path instead of adapting it through a thread.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response: Callable):
         """
         Initialize middleware.
@@ -45,11 +77,15 @@ class BotchaVerifyMiddleware:
             get_response: Django middleware get_response callable
         """
         self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
 
         # Load configuration from settings
-        self.secret = getattr(settings, "BOTCHA_SECRET", None)
-        if not self.secret:
+        secret: Optional[str] = getattr(settings, "BOTCHA_SECRET", None)
+        if not secret:
             raise ValueError("BOTCHA_SECRET must be set in Django settings")
+        self.secret: str = secret
 
         self.audience = getattr(settings, "BOTCHA_AUDIENCE", None)
         self.protected_paths: List[str] = getattr(
@@ -57,6 +93,16 @@ class BotchaVerifyMiddleware:
         )
         self.excluded_paths: List[str] = getattr(settings, "BOTCHA_EXCLUDED_PATHS", [])
 
+        # Options are fixed per middleware instance; share one interned object
+        self._options = VerifyOptions.interned(
+            audience=self.audience,
+            client_ip=None,  # Don't enforce IP by default
+        )
+
+        # Match each prefix list with a single compiled regex instead of a loop
+        self._protected_re = _compile_prefixes(self.protected_paths)
+        self._excluded_re = _compile_prefixes(self.excluded_paths)
+
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """
         Process request through middleware.
@@ -67,42 +113,77 @@ class BotchaVerifyMiddleware:
         Returns:
             HttpResponse from next middleware or view
         """
+        if self._is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+
+        get_response = self.get_response
+
         # Check if path should be protected
         if not self._should_verify_path(request.path):
-            return self.get_response(request)
+            return get_response(request)
 
         # Extract token from Authorization header
         auth_header = request.headers.get("Authorization")
         token = extract_bearer_token(auth_header)
 
         if not token:
-            return JsonResponse(
-                {
-                    "error": "Missing or invalid Authorization header",
-                    "detail": "Expected: Authorization: Bearer <token>",
-                },
-                status=401,
-            )
-
-        # Get client IP for optional validation
-        client_ip = self._get_client_ip(request)
+            return self._missing_token_response()
 
         # Verify token
-        options = VerifyOptions(
-            audience=self.audience,
-            client_ip=None,  # Don't enforce IP by default
-        )
-        result = verify_botcha_token(token, self.secret, options)
+        result = verify_botcha_token(token, self.secret, self._options)
 
         if not result.valid:
-            return JsonResponse(
-                {"error": "Invalid token", "detail": result.error}, status=401
-            )
+            return self._invalid_token_response(result.error)
 
         # Attach payload to request for use in views
         request.botcha = result.payload  # type: ignore
 
-        return self.get_response(request)
+        return get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Process request through middleware in an async middleware chain.
+
+        Path and header checks run inline; token verification only leaves the
+        event loop when the token isn't already in the verification cache.
+
+        Args:
+            request: Django HttpRequest
+
+        Returns:
+            HttpResponse from next middleware or view
+        """
+        if not self._should_verify_path(request.path):
+            return await self.get_response(request)
+
+        token = extract_bearer_token(request.headers.get("Authorization"))
+        if not token:
+            return self._missing_token_response()
+
+        options = self._options
+        cache_key = _cache_key(token, self.secret, options)
+        result = _get_cached(cache_key)
+        if result is None:
+            result = await sync_to_async(_verify, thread_sensitive=False)(
+                token, self.secret, options, cache_key
+            )
+
+        if not result.valid:
+            return self._invalid_token_response(result.error)
+
+        request.botcha = result.payload  # type: ignore
+
+        return await self.get_response(request)
+
+    def _missing_token_response(self) -> HttpResponse:
+        """Build the 401 response for a missing or malformed Authorization header."""
+        return HttpResponse(
+            _MISSING_TOKEN_BODY, status=401, content_type="application/json"
+        )
+
+    def _invalid_token_response(self, error: Optional[str]) -> HttpResponse:
+        """Build the 401 response for a token that failed verification."""
+        return JsonResponse({"error": "Invalid token", "detail": error}, status=401)
 
     def _should_verify_path(self, path: str) -> bool:
         """
@@ -115,16 +196,11 @@ class BotchaVerifyMiddleware:
             True if path should be verified, False otherwise
         """
         # Check excluded paths first
-        for excluded in self.excluded_paths:
-            if path.startswith(excluded):
-                return False
+        if self._excluded_re is not None and self._excluded_re.match(path):
+            return False
 
         # Check protected paths
-        for protected in self.protected_paths:
-            if path.startswith(protected):
-                return True
-
-        return False
+        return self._protected_re is not None and bool(self._protected_re.match(path))
 
     def _get_client_ip(self, request: HttpRequest) -> Optional[str]:
         """
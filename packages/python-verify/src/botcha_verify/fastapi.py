@@ -3,16 +3,21 @@
 from typing import Optional
 
 try:
+    import anyio.to_thread
     from fastapi import HTTPException, Request
-    from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 except ImportError:
     raise ImportError(
         "FastAPI is not installed. Install it with: pip install 'botcha-verify[fastapi]'"
     )
 
-from .verify import verify_botcha_token, extract_bearer_token
+from .verify import _cache_key, _get_cached, _verify, extract_bearer_token
 from .types import BotchaPayload, VerifyOptions
 
+# Tokens at least this long are verified in a worker thread so HMAC + JSON
+# decoding doesn't block the event loop. Shorter tokens verify faster inline
+# than a thread round-trip.
+THREAD_OFFLOAD_MIN_TOKEN_LENGTH = 512
+
 
 class BotchaVerify:
     """
@@ -27,6 +32,11 @@ class BotchaVerify:
         async def get_data(token: BotchaPayload = Depends(botcha)):
             print(f"Solved in {token.solve_time}ms")
             return {"data": "protected"}
+
+    The Authorization header is read directly from the request. To document
+    the bearer scheme in OpenAPI, add it at the route or router level:
+
+        app.include_router(router, dependencies=[Security(HTTPBearer(auto_error=False))])
     """
 
     def __init__(
@@ -44,19 +54,19 @@ class BotchaVerify:
         self.secret = secret
         self.audience = audience
         self.auto_error = auto_error
-        self.security = HTTPBearer(auto_error=auto_error)
 
-    async def __call__(
-        self,
-        request: Request,
-        credentials: Optional[HTTPAuthorizationCredentials] = None,
-    ) -> Optional[BotchaPayload]:
+        # Options are fixed per dependency instance; share one interned object
+        self._options = VerifyOptions.interned(
+            audience=audience,
+            client_ip=None,  # Don't enforce IP by default in FastAPI
+        )
+
+    async def __call__(self, request: Request) -> Optional[BotchaPayload]:
         """
         Verify token from request Authorization header.
 
         Args:
             request: FastAPI request object
-            credentials: HTTP Bearer credentials (auto-extracted by FastAPI)
 
         Returns:
             BotchaPayload if token is valid, None if invalid (when auto_error=False)
@@ -65,12 +75,7 @@ class BotchaVerify:
             HTTPException: If token is invalid and auto_error=True
         """
         # Extract token from Authorization header
-        if credentials:
-            token = credentials.credentials
-        else:
-            # Manual extraction as fallback
-            auth_header = request.headers.get("Authorization")
-            token = extract_bearer_token(auth_header)
+        token = extract_bearer_token(request.headers.get("authorization"))
 
         if not token:
             if self.auto_error:
@@ -81,15 +86,18 @@ class BotchaVerify:
                 )
             return None
 
-        # Get client IP for optional validation
-        client_ip = request.client.host if request.client else None
-
         # Verify token
-        options = VerifyOptions(
-            audience=self.audience,
-            client_ip=None,  # Don't enforce IP by default in FastAPI
-        )
-        result = verify_botcha_token(token, self.secret, options)
+        secret = self.secret
+        options = self._options
+        cache_key = _cache_key(token, secret, options)
+        result = _get_cached(cache_key)
+        if result is None:
+            if len(token) >= THREAD_OFFLOAD_MIN_TOKEN_LENGTH:
+                result = await anyio.to_thread.run_sync(
+                    _verify, token, secret, options, cache_key
+                )
+            else:
+                result = _verify(token, secret, options, cache_key)
 
         if not result.valid:
             if self.auto_error:
@@ -1,10 +1,11 @@
 """Type definitions for BOTCHA verification."""
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Mapping, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BotchaPayload:
     """JWT payload structure for BOTCHA verified tokens."""
 
@@ -17,16 +18,39 @@ class BotchaPayload:
     aud: Optional[str] = None  # optional audience claim
     client_ip: Optional[str] = None  # optional client IP binding
 
-
-@dataclass
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> "BotchaPayload":
+        """Build a payload from decoded JWT claims."""
+        get = claims.get
+        return cls(
+            claims["sub"],
+            claims["iat"],
+            claims["exp"],
+            claims["jti"],
+            claims["type"],
+            get("solveTime", get("solve_time", 0)),
+            get("aud"),
+            get("client_ip"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class VerifyOptions:
     """Options for token verification."""
 
     audience: Optional[str] = None  # required audience
     client_ip: Optional[str] = None  # client IP to validate against
 
+    @classmethod
+    @lru_cache(maxsize=256)
+    def interned(
+        cls, audience: Optional[str] = None, client_ip: Optional[str] = None
+    ) -> "VerifyOptions":
+        """Return a shared instance for these options (bounded cache)."""
+        return cls(audience=audience, client_ip=client_ip)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerifyResult:
     """Result of token verification."""
 
@@ -1,13 +1,262 @@
 """Core BOTCHA JWT token verification."""
 
-import jwt
-from typing import Optional
+import binascii
+import hashlib
+import hmac
+import re
+import threading
+import time
+from base64 import urlsafe_b64decode
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    # Rust-backed, API-compatible drop-in for PyJWT (botcha-verify[fast])
+    import jwt_rs as jwt  # type: ignore[import-not-found]
+except ImportError:
+    import jwt
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
 from .types import BotchaPayload, VerifyOptions, VerifyResult
 
+# jwt_rs does HMAC and JSON natively; PyJWT gets its own tuned decoder instance
+# so the global jwt module is left untouched.
+if jwt.__name__ == "jwt":
+    from jwt.algorithms import HMACAlgorithm
 
-def verify_botcha_token(
+    class _KeyedHMACAlgorithm(HMACAlgorithm):
+        """
+        HMAC algorithm that keys the hash once per secret.
+
+        The keyed inner/outer pad state is kept as a template and copied for
+        each message, saving the key setup on every verification.
+        """
+
+        _MAX_KEYS = 64
+
+        def __init__(self, hash_alg: Any) -> None:
+            super().__init__(hash_alg)
+            self._keyed: Dict[bytes, Any] = {}
+
+        def sign(self, msg: bytes, key: bytes) -> bytes:
+            template = self._keyed.get(key)
+            if template is None:
+                if len(self._keyed) >= self._MAX_KEYS:
+                    self._keyed.clear()
+                template = hmac.new(key, digestmod=self.hash_alg)
+                self._keyed[key] = template
+            mac = template.copy()
+            mac.update(msg)
+            return mac.digest()
+
+    class _BotchaPyJWT(jwt.PyJWT):
+        """PyJWT decoder using keyed HMAC templates and, if available, orjson."""
+
+        def __init__(self) -> None:
+            super().__init__()
+            # PyJWT >= 2.11 gives each PyJWT its own PyJWS. Older releases
+            # verify through the module-global one, which is left alone, so
+            # they keep the stock HMAC and only get the payload decoder.
+            jws = getattr(self, "_jws", None)
+            if jws is not None:
+                jws.unregister_algorithm("HS256")
+                jws.register_algorithm(
+                    "HS256", _KeyedHMACAlgorithm(HMACAlgorithm.SHA256)
+                )
+
+        if orjson is not None:
+
+            def _decode_payload(self, decoded: Dict[str, Any]) -> Dict[str, Any]:
+                try:
+                    payload = orjson.loads(decoded["payload"])
+                except (ValueError, RecursionError) as e:
+                    raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+                if not isinstance(payload, dict):
+                    raise jwt.DecodeError(
+                        "Invalid payload string: must be a json object"
+                    )
+                return payload
+
+    _jwt_decode = _BotchaPyJWT().decode
+else:
+    _jwt_decode = jwt.decode
+
+# Process-local LRU caches of verification results, keyed by a keyed token digest.
+# Entries are (expires_at, VerifyResult).
+# - _VERIFIED_CACHE holds successful results until the token's own exp.
+# - _INVALID_CACHE briefly remembers tokens rejected as malformed or badly signed,
+#   so junk-token floods skip base64 + HMAC. Expired and not-yet-valid tokens are
+#   not remembered there.
+_CACHE_MAX = 4096
+_VERIFIED_CACHE: "OrderedDict[bytes, Tuple[float, VerifyResult]]" = OrderedDict()
+_INVALID_CACHE_MAX = 1024
+_INVALID_CACHE_TTL = 10.0
+_INVALID_CACHE: "OrderedDict[bytes, Tuple[float, VerifyResult]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Results are immutable, so constant rejections can be shared
+_EXPIRED_RESULT = VerifyResult(valid=False, error="Token has expired")
+
+# Early expiry check on the unverified payload (see _peek_exp)
+_EXP_RE = re.compile(rb'"exp"\s*:\s*(\d+)')
+_PEEK_MAX_PAYLOAD_LENGTH = 2048
+
+_BEARER_PREFIX = "Bearer "
+_BEARER_PREFIX_BYTES = b"Bearer "
+_BEARER_LEN = len(_BEARER_PREFIX)
+
+
+@lru_cache(maxsize=64)
+def _decode_kwargs(audience: Optional[str]) -> Dict[str, Any]:
+    """
+    Build jwt.decode keyword arguments for an audience.
+
+    Memoized so each request reuses the same dicts; callers must not mutate them.
+    """
+    decode_kwargs: Dict[str, Any] = {
+        "algorithms": ["HS256"],
+        "options": {
+            "require": ["sub", "iat", "exp", "jti"],
+        },
+    }
+
+    # Add audience verification if provided
+    if audience:
+        decode_kwargs["audience"] = audience
+
+    return decode_kwargs
+
+
+@lru_cache(maxsize=64)
+def _secret_digest(secret: str) -> bytes:
+    """
+    Hash a secret down to a blake2b key.
+
+    blake2b keys are capped at 64 bytes; hashing keeps every byte of longer
+    secrets significant, so secrets sharing a prefix never share cache keys.
+    """
+    return hashlib.blake2b(secret.encode(), digest_size=32).digest()
+
+
+def _cache_key(token: str, secret: str, options: Optional[VerifyOptions]) -> bytes:
+    """Build a cache key bound to the token, secret, audience and client IP."""
+    audience = options.audience if options else None
+    client_ip = options.client_ip if options else None
+    digest = hashlib.blake2b(
+        token.encode(), key=_secret_digest(secret), digest_size=16
+    ).digest()
+    return b"\0".join(
+        (digest, (audience or "").encode(), (client_ip or "").encode())
+    )
+
+
+def _cache_get(
+    cache: "OrderedDict[bytes, Tuple[float, VerifyResult]]", cache_key: bytes
+) -> Optional[VerifyResult]:
+    """Return the cached result for a key if present and not yet expired."""
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None
+    if entry[0] > time.time():
+        cache.move_to_end(cache_key)
+        return entry[1]
+    del cache[cache_key]
+    return None
+
+
+def _cache_put(
+    cache: "OrderedDict[bytes, Tuple[float, VerifyResult]]",
+    cache_key: bytes,
+    expires_at: float,
+    result: VerifyResult,
+    maxsize: int,
+) -> None:
+    """Store a result, evicting the least recently used entry when full."""
+    with _CACHE_LOCK:
+        cache[cache_key] = (expires_at, result)
+        cache.move_to_end(cache_key)
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+
+
+def _get_cached(cache_key: bytes) -> Optional[VerifyResult]:
+    """Return a cached successful or rejected result for a key, if any."""
+    with _CACHE_LOCK:
+        result = _cache_get(_VERIFIED_CACHE, cache_key)
+        if result is None:
+            result = _cache_get(_INVALID_CACHE, cache_key)
+        return result
+
+
+def get_cached_result(
     token: str, secret: str, options: Optional[VerifyOptions] = None
+) -> Optional[VerifyResult]:
+    """
+    Look up a cached verification result without verifying the token.
+
+    Args:
+        token: JWT token string
+        secret: Secret key for verification
+        options: Optional verification options
+
+    Returns:
+        Cached VerifyResult, or None if the token has not been verified recently
+    """
+    return _get_cached(_cache_key(token, secret, options))
+
+
+def clear_verify_cache() -> None:
+    """Drop all cached verification results."""
+    with _CACHE_LOCK:
+        _VERIFIED_CACHE.clear()
+        _INVALID_CACHE.clear()
+
+
+def has_openssl_sha256() -> bool:
+    """
+    Report whether SHA-256 (and so HS256 HMAC) runs on OpenSSL's libcrypto.
+
+    OpenSSL selects SHA-NI / ARMv8 SHA instructions at runtime when the CPU
+    supports them. The pure-Python/builtin fallback does not.
+
+    Returns:
+        True if hashlib's sha256 is backed by OpenSSL
+    """
+    return type(hashlib.sha256()).__module__ == "_hashlib"
+
+
+def _peek_exp(token: str) -> Optional[int]:
+    """
+    Read the exp claim from a token's payload without verifying it.
+
+    Only used to reject expired tokens before paying for signature
+    verification; never trusted to accept a token. Returns None whenever the
+    claim can't be read unambiguously, leaving the decision to jwt.decode.
+    """
+    segments = token.split(".", 2)
+    if len(segments) != 3 or len(segments[1]) > _PEEK_MAX_PAYLOAD_LENGTH:
+        return None
+    payload_b64 = segments[1]
+    try:
+        payload_bytes = urlsafe_b64decode(payload_b64 + "=" * (-len(payload_b64) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    matches = _EXP_RE.findall(payload_bytes)
+    if len(matches) != 1:
+        return None
+    return int(matches[0])
+
+
+def verify_botcha_token(
+    token: str,
+    secret: str,
+    options: Optional[VerifyOptions] = None,
+    use_cache: bool = True,
 ) -> VerifyResult:
     """
     Verify a BOTCHA JWT token.
@@ -22,6 +271,8 @@ def verify_botcha_token(
         token: JWT token string
         secret: Secret key for verification
         options: Optional verification options
+        use_cache: Reuse results of earlier successful verifications of the
+                   same token until it expires (default: True)
 
     Returns:
         VerifyResult with valid flag, payload, or error message
@@ -31,77 +282,145 @@ def verify_botcha_token(
         >>> if result.valid:
         ...     print(f"Solved in {result.payload.solve_time}ms")
     """
+    cache_key = None
+    if use_cache:
+        cache_key = _cache_key(token, secret, options)
+        cached = _get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+    return _verify(token, secret, options, cache_key)
+
+
+def _verify(
+    token: str,
+    secret: str,
+    options: Optional[VerifyOptions],
+    cache_key: Optional[bytes],
+) -> VerifyResult:
+    """
+    Verify a token that missed the cache, storing the outcome under cache_key.
+
+    Lets callers that already looked the token up reuse its cache key instead
+    of hashing it again. Pass cache_key=None to skip caching.
+    """
+    # Expired tokens (e.g. replays) are rejected without computing the HMAC
+    exp = _peek_exp(token)
+    if exp is not None and exp <= time.time():
+        return _EXPIRED_RESULT
+
     try:
         # Decode and verify JWT signature, expiry, and audience
         # PyJWT handles audience verification if passed as parameter
-        decode_kwargs = {
-            "algorithms": ["HS256"],
-            "options": {
-                "require": ["sub", "iat", "exp", "jti"],
-            },
-        }
-
-        # Add audience verification if provided
-        if options and options.audience:
-            decode_kwargs["audience"] = options.audience
+        decode_kwargs = _decode_kwargs(options.audience if options else None)
+        payload = _jwt_decode(token, secret, **decode_kwargs)
 
-        payload = jwt.decode(token, secret, **decode_kwargs)
-
-        # Check token type (must be access token, not refresh token)
+        # Check token type (must be access token, not refresh token) and
+        # client IP binding (if required) with a single test on the success path
         token_type = payload.get("type")
-        if token_type != "botcha-verified":
+        required_ip = options.client_ip if options else None
+        if token_type != "botcha-verified" or (
+            required_ip and payload.get("client_ip") != required_ip
+        ):
+            if token_type != "botcha-verified":
+                return VerifyResult(
+                    valid=False,
+                    error=f"Invalid token type: expected 'botcha-verified', got '{token_type}'",
+                )
             return VerifyResult(
                 valid=False,
-                error=f"Invalid token type: expected 'botcha-verified', got '{token_type}'",
+                error=f"Client IP mismatch: expected '{required_ip}', got '{payload.get('client_ip')}'",
             )
 
-        # Validate client IP binding (if required)
-        if options and options.client_ip:
-            token_ip = payload.get("client_ip")
-            if not token_ip or token_ip != options.client_ip:
-                return VerifyResult(
-                    valid=False,
-                    error=f"Client IP mismatch: expected '{options.client_ip}', got '{token_ip}'",
-                )
+        # Built once per token; cache hits return the same payload object
+        botcha_payload = BotchaPayload.from_claims(payload)
 
-        # Build payload dataclass
-        botcha_payload = BotchaPayload(
-            sub=payload["sub"],
-            iat=payload["iat"],
-            exp=payload["exp"],
-            jti=payload["jti"],
-            type=payload["type"],
-            solve_time=payload.get(
-                "solveTime", 0
-            ),  # Handle both solveTime and solve_time
-            aud=payload.get("aud"),
-            client_ip=payload.get("client_ip"),
-        )
-
-        return VerifyResult(valid=True, payload=botcha_payload)
+        result = VerifyResult(valid=True, payload=botcha_payload)
+
+        if cache_key is not None:
+            _cache_put(
+                _VERIFIED_CACHE, cache_key, float(payload["exp"]), result, _CACHE_MAX
+            )
+
+        return result
 
     except jwt.ExpiredSignatureError:
-        return VerifyResult(valid=False, error="Token has expired")
-    except jwt.InvalidTokenError as e:
+        return _EXPIRED_RESULT
+    except jwt.ImmatureSignatureError as e:
+        # May become valid within seconds, so never remembered as invalid
         return VerifyResult(valid=False, error=f"Invalid token: {str(e)}")
+    except jwt.InvalidTokenError as e:
+        result = VerifyResult(valid=False, error=f"Invalid token: {str(e)}")
+        if cache_key is not None:
+            _cache_put(
+                _INVALID_CACHE,
+                cache_key,
+                time.time() + _INVALID_CACHE_TTL,
+                result,
+                _INVALID_CACHE_MAX,
+            )
+        return result
     except Exception as e:
         return VerifyResult(valid=False, error=f"Token verification failed: {str(e)}")
 
 
-def extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
+def verify_botcha_tokens(
+    tokens: Iterable[str],
+    secret: str,
+    options: Optional[VerifyOptions] = None,
+    use_cache: bool = True,
+) -> List[VerifyResult]:
+    """
+    Verify many BOTCHA JWT tokens against the same secret and options.
+
+    Intended for bulk endpoints (webhooks, admin tools). Each distinct token
+    is verified once with verify_botcha_token and its result reused for any
+    duplicates in the batch.
+
+    Args:
+        tokens: JWT token strings
+        secret: Secret key for verification
+        options: Optional verification options
+        use_cache: Use the process-wide verification cache (default: True)
+
+    Returns:
+        One VerifyResult per token, in input order
+    """
+    seen: Dict[str, VerifyResult] = {}
+    results = []
+    for token in tokens:
+        result = seen.get(token)
+        if result is None:
+            result = verify_botcha_token(token, secret, options, use_cache)
+            seen[token] = result
+        results.append(result)
+    return results
+
+
+def extract_bearer_token(auth_header: Union[str, bytes, None]) -> Optional[str]:
     """
     Extract Bearer token from Authorization header.
 
+    Accepts the header as ``str`` or as the raw ``bytes`` some servers expose
+    (e.g. ASGI scope headers), avoiding a separate decode of the full header.
+
     Args:
         auth_header: Authorization header value (e.g., "Bearer eyJhbG...")
 
     Returns:
-        Token string without "Bearer " prefix, or None if not found
+        Token string without "Bearer " prefix, or None if not found or empty
     """
-    if not auth_header:
+    # One length check rejects missing headers and a bare "Bearer " alike
+    if not auth_header or len(auth_header) <= _BEARER_LEN:
         return None
 
-    if not auth_header.startswith("Bearer "):
+    if isinstance(auth_header, bytes):
+        if not auth_header.startswith(_BEARER_PREFIX_BYTES):
+            return None
+        # Decode straight from a view so the token bytes are copied only once
+        return str(memoryview(auth_header)[_BEARER_LEN:], "latin-1")
+
+    if not auth_header.startswith(_BEARER_PREFIX):
         return None
 
-    return auth_header[7:]  # Remove "Bearer " prefix
+    return auth_header[_BEARER_LEN:]  # Remove "Bearer " prefix
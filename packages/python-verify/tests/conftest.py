@@ -4,6 +4,14 @@ import jwt
 import pytest
 from datetime import datetime, timedelta, timezone
 
+from botcha_verify import clear_verify_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_verify_cache():
+    """Start every test with empty process-wide verification caches."""
+    clear_verify_cache()
+
 
 @pytest.fixture
 def secret():
@@ -7,6 +7,7 @@ pytest.importorskip("django")
 import json
 from unittest.mock import Mock, patch
 
+from asgiref.sync import iscoroutinefunction
 from django.conf import settings
 from django.test import RequestFactory
 
@@ -68,8 +69,12 @@ def test_django_missing_token(middleware, request_factory):
     response = middleware(request)
 
     assert response.status_code == 401
+    assert response["Content-Type"] == "application/json"
     data = json.loads(response.content)
-    assert "error" in data
+    assert data == {
+        "error": "Missing or invalid Authorization header",
+        "detail": "Expected: Authorization: Bearer <token>",
+    }
 
 
 def test_django_invalid_token(middleware, request_factory):
@@ -164,3 +169,96 @@ def test_django_with_audience(request_factory, get_response, valid_token_with_au
         assert response.status_code == 200
         assert hasattr(request, "botcha")
         assert request.botcha.aud == "https://api.example.com"
+
+
+@pytest.fixture
+def async_middleware():
+    """Create middleware instance wrapping an async get_response."""
+
+    async def response_callable(request):
+        from django.http import JsonResponse
+
+        return JsonResponse({"message": "success"})
+
+    return BotchaVerifyMiddleware(response_callable)
+
+
+def test_django_async_capable(middleware, async_middleware):
+    """Test middleware advertises both sync and async support."""
+    assert BotchaVerifyMiddleware.sync_capable is True
+    assert BotchaVerifyMiddleware.async_capable is True
+    assert not iscoroutinefunction(middleware)
+    assert iscoroutinefunction(async_middleware)
+
+
+@pytest.mark.asyncio
+async def test_django_async_valid_token(async_middleware, request_factory, valid_token):
+    """Test async middleware path with valid token."""
+    request = request_factory.get(
+        "/api/data", HTTP_AUTHORIZATION=f"Bearer {valid_token}"
+    )
+
+    response = await async_middleware(request)
+
+    assert response.status_code == 200
+    assert request.botcha.sub == "test-challenge-123"
+
+
+@pytest.mark.asyncio
+async def test_django_async_missing_token(async_middleware, request_factory):
+    """Test async middleware path without token."""
+    request = request_factory.get("/api/data")
+
+    response = await async_middleware(request)
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_django_async_invalid_token(async_middleware, request_factory):
+    """Test async middleware path with invalid token."""
+    request = request_factory.get(
+        "/api/data", HTTP_AUTHORIZATION="Bearer invalid-token"
+    )
+
+    response = await async_middleware(request)
+
+    assert response.status_code == 401
+    assert "error" in json.loads(response.content)
+
+
+@pytest.mark.asyncio
+async def test_django_async_unprotected_path(async_middleware, request_factory):
+    """Test async middleware path passes unprotected paths through."""
+    request = request_factory.get("/public/page")
+
+    response = await async_middleware(request)
+
+    assert response.status_code == 200
+    assert not hasattr(request, "botcha")
+
+
+def test_django_path_matching_with_multiple_prefixes(get_response):
+    """Test path protection with several prefixes, including regex metacharacters."""
+    with patch.object(
+        settings, "BOTCHA_PROTECTED_PATHS", ["/api/", "/v2.0/", "/admin"]
+    ), patch.object(
+        settings, "BOTCHA_EXCLUDED_PATHS", ["/api/health", "/v2.0/public"]
+    ):
+        middleware = BotchaVerifyMiddleware(get_response)
+
+    assert middleware._should_verify_path("/api/users") is True
+    assert middleware._should_verify_path("/v2.0/items") is True
+    assert middleware._should_verify_path("/v2x0/items") is False
+    assert middleware._should_verify_path("/admin/panel") is True
+    assert middleware._should_verify_path("/api/health/live") is False
+    assert middleware._should_verify_path("/v2.0/public/docs") is False
+    assert middleware._should_verify_path("/public/api/") is False
+
+
+def test_django_no_protected_paths(get_response):
+    """Test that nothing is verified when no protected paths are configured."""
+    with patch.object(settings, "BOTCHA_PROTECTED_PATHS", []):
+        middleware = BotchaVerifyMiddleware(get_response)
+
+    assert middleware._should_verify_path("/api/data") is False
@@ -1,12 +1,18 @@
 """Tests for FastAPI middleware."""
 
+import threading
+from datetime import datetime, timedelta, timezone
+
+import jwt
 import pytest
 
 pytest.importorskip("fastapi")
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.testclient import TestClient
 
+import botcha_verify.fastapi as botcha_fastapi
 from botcha_verify.fastapi import BotchaVerify
 from botcha_verify.types import BotchaPayload
 
@@ -49,6 +55,7 @@ def test_fastapi_missing_token(secret):
     response = client.get("/protected")
 
     assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
     assert (
         "authorization" in response.json()["detail"].lower()
         or "missing" in response.json()["detail"].lower()
@@ -141,3 +148,93 @@ def test_fastapi_auto_error_false(secret):
     # Should return 200 with custom response instead of 401
     assert response.status_code == 200
     assert response.json()["message"] == "no token"
+
+
+def test_fastapi_401_headers_not_shared(secret):
+    """Test that a handler mutating exc.headers does not leak into later 401s."""
+    app = FastAPI()
+    botcha = BotchaVerify(secret=secret)
+
+    handled = []
+
+    @app.exception_handler(HTTPException)
+    async def tag_first_handler(request, exc):
+        # Only the first 401 is tagged
+        if not handled:
+            exc.headers["X-Tag"] = "first"
+        handled.append(exc)
+        return await http_exception_handler(request, exc)
+
+    @app.get("/protected")
+    async def protected(token: BotchaPayload = Depends(botcha)):
+        return {"message": "success"}
+
+    client = TestClient(app)
+    assert client.get("/protected").headers["X-Tag"] == "first"
+    response = client.get("/protected")
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert "X-Tag" not in response.headers
+
+
+def test_fastapi_long_token_verified_off_loop(secret, monkeypatch):
+    """Test that long tokens are verified in a worker thread."""
+    token = jwt.encode(
+        {
+            "sub": "x" * 600,
+            "iat": datetime.now(timezone.utc),
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+            "jti": "test-jti-long",
+            "type": "botcha-verified",
+            "solveTime": 1234,
+        },
+        secret,
+        algorithm="HS256",
+    )
+    verify_threads = []
+    real_verify = botcha_fastapi._verify
+
+    def tracking_verify(*args, **kwargs):
+        verify_threads.append(threading.get_ident())
+        return real_verify(*args, **kwargs)
+
+    monkeypatch.setattr(botcha_fastapi, "_verify", tracking_verify)
+
+    app = FastAPI()
+    botcha = BotchaVerify(secret=secret)
+    loop_threads = []
+
+    @app.get("/protected")
+    async def protected(token: BotchaPayload = Depends(botcha)):
+        loop_threads.append(threading.get_ident())
+        return {"message": "success"}
+
+    client = TestClient(app)
+    response = client.get("/protected", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert len(verify_threads) == 1
+    assert verify_threads[0] != loop_threads[0]
+
+    # Second request is served from the verification cache
+    response = client.get("/protected", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert len(verify_threads) == 1
+
+
+def test_fastapi_wrong_scheme(secret):
+    """Test FastAPI middleware rejects non-Bearer Authorization headers."""
+    app = FastAPI()
+    botcha = BotchaVerify(secret=secret)
+
+    @app.get("/protected")
+    async def protected(token: BotchaPayload = Depends(botcha)):
+        return {"message": "success"}
+
+    client = TestClient(app)
+    response = client.get(
+        "/protected", headers={"Authorization": "Basic dXNlcjpwYXNz"}
+    )
+
+    assert response.status_code == 401
@@ -1,11 +1,20 @@
 """Tests for core BOTCHA token verification."""
 
+import time
+
 import jwt
 import pytest
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
-from botcha_verify import verify_botcha_token, extract_bearer_token
-from botcha_verify.types import VerifyOptions
+from botcha_verify import (
+    extract_bearer_token,
+    has_openssl_sha256,
+    verify_botcha_token,
+    verify_botcha_tokens,
+)
+from botcha_verify import verify as verify_module
+from botcha_verify.types import BotchaPayload, VerifyOptions
 
 
 def test_verify_valid_token(valid_token, secret):
@@ -120,6 +129,22 @@ def test_extract_bearer_token_wrong_scheme():
     assert token is None
 
 
+def test_extract_bearer_token_empty_token():
+    """Test that a bare Bearer prefix yields no token."""
+    assert extract_bearer_token("Bearer ") is None
+    assert extract_bearer_token("Bearer") is None
+    assert extract_bearer_token(b"Bearer ") is None
+
+
+def test_extract_bearer_token_bytes():
+    """Test extraction from a raw bytes header."""
+    token = extract_bearer_token(b"Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test")
+    assert token == "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test"
+
+    assert extract_bearer_token(b"") is None
+    assert extract_bearer_token(b"Basic dXNlcjpwYXNz") is None
+
+
 def test_verify_token_missing_required_fields(secret):
     """Test verification of token missing required fields."""
     # Token without jti
@@ -135,3 +160,266 @@ def test_verify_token_missing_required_fields(secret):
 
     assert result.valid is False
     assert result.error is not None
+
+
+def test_verify_caches_valid_result(valid_token, secret):
+    """Test that repeated verification of a valid token hits the cache."""
+    first = verify_botcha_token(valid_token, secret)
+    second = verify_botcha_token(valid_token, secret)
+
+    assert first.valid is True
+    assert second is first
+
+
+def test_verify_cache_reuses_payload(valid_token, secret):
+    """Test that the payload is materialized once per cached token."""
+    with patch.object(
+        BotchaPayload, "from_claims", wraps=BotchaPayload.from_claims
+    ) as from_claims:
+        for _ in range(3):
+            result = verify_botcha_token(valid_token, secret)
+
+    assert from_claims.call_count == 1
+    assert isinstance(result.payload, BotchaPayload)
+
+
+def test_verify_cache_disabled(valid_token, secret):
+    """Test that use_cache=False always runs a full verification."""
+    first = verify_botcha_token(valid_token, secret, use_cache=False)
+    second = verify_botcha_token(valid_token, secret, use_cache=False)
+
+    assert first.valid is True
+    assert second.valid is True
+    assert second is not first
+
+
+def test_verify_cache_keyed_by_secret_and_options(valid_token_with_audience, secret):
+    """Test that cached results are not shared across secrets or audiences."""
+    options = VerifyOptions(audience="https://api.example.com")
+    assert verify_botcha_token(valid_token_with_audience, secret, options).valid
+
+    wrong_secret = verify_botcha_token(valid_token_with_audience, "wrong-secret", options)
+    assert wrong_secret.valid is False
+
+    wrong_aud = VerifyOptions(audience="https://different-api.example.com")
+    assert verify_botcha_token(valid_token_with_audience, secret, wrong_aud).valid is False
+
+
+def test_verify_cache_keyed_by_full_secret(challenge_id):
+    """Test that secrets sharing a long prefix never share cached results."""
+    prefix = "s" * 64
+    payload = {
+        "sub": challenge_id,
+        "iat": datetime.now(timezone.utc),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "jti": "test-jti-prefix",
+        "type": "botcha-verified",
+    }
+    token = jwt.encode(payload, prefix + "-a", algorithm="HS256")
+
+    assert verify_botcha_token(token, prefix + "-a").valid is True
+    assert verify_botcha_token(token, prefix + "-b").valid is False
+
+
+def test_verify_does_not_cache_failures_as_valid(expired_token, secret):
+    """Test that failed verifications never enter the verified cache."""
+    verify_botcha_token(expired_token, secret)
+    verify_botcha_token("not-a-valid-jwt", secret)
+
+    assert len(verify_module._VERIFIED_CACHE) == 0
+
+
+def test_verify_types_are_immutable(valid_token, secret):
+    """Test that result types are frozen and hashable."""
+    result = verify_botcha_token(valid_token, secret)
+
+    with pytest.raises(AttributeError):
+        result.valid = False  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        result.payload.sub = "other"  # type: ignore[misc]
+
+    assert hash(VerifyOptions(audience="a")) == hash(VerifyOptions(audience="a"))
+
+
+def test_verify_remembers_invalid_tokens(valid_token, secret):
+    """Test that badly signed tokens are rejected from the negative cache."""
+    first = verify_botcha_token(valid_token, "wrong-secret")
+
+    with patch.object(verify_module, "_jwt_decode") as decode:
+        second = verify_botcha_token(valid_token, "wrong-secret")
+
+    assert first.valid is False
+    assert second is first
+    decode.assert_not_called()
+
+    # The same token is still accepted with the right secret
+    assert verify_botcha_token(valid_token, secret).valid is True
+
+
+def test_verify_does_not_remember_expired_tokens(expired_token, secret):
+    """Test that expired tokens are not kept in the negative cache."""
+    verify_botcha_token(expired_token, secret)
+
+    assert len(verify_module._INVALID_CACHE) == 0
+
+
+def test_verify_invalid_cache_entries_expire(secret):
+    """Test that negative cache entries are dropped after their TTL."""
+    verify_botcha_token("not-a-valid-jwt", secret)
+    assert len(verify_module._INVALID_CACHE) == 1
+
+    with patch.object(
+        verify_module.time, "time", return_value=time.time() + 60
+    ):
+        assert verify_module.get_cached_result("not-a-valid-jwt", secret) is None
+
+    assert len(verify_module._INVALID_CACHE) == 0
+
+
+def test_verify_reuses_decode_kwargs(valid_token_with_audience, secret):
+    """Test that jwt.decode arguments are built once per audience."""
+    options = VerifyOptions(audience="https://api.example.com")
+
+    with patch.object(
+        verify_module, "_jwt_decode", wraps=verify_module._jwt_decode
+    ) as decode:
+        verify_botcha_token(valid_token_with_audience, secret, options, use_cache=False)
+        verify_botcha_token(valid_token_with_audience, secret, options, use_cache=False)
+
+    first, second = decode.call_args_list
+    assert first.kwargs["audience"] == "https://api.example.com"
+    assert first.kwargs["options"] is second.kwargs["options"]
+
+
+def test_verify_client_ip_missing_from_token(valid_token, secret):
+    """Test that IP binding rejects tokens without a client_ip claim."""
+    options = VerifyOptions(client_ip="10.0.0.1")
+    result = verify_botcha_token(valid_token, secret, options)
+
+    assert result.valid is False
+    assert "IP" in result.error
+
+
+def test_verify_accepts_snake_case_solve_time(secret):
+    """Test that solve_time is read when solveTime is absent."""
+    payload = {
+        "sub": "test-challenge",
+        "iat": datetime.now(timezone.utc),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "jti": "test-jti-snake",
+        "type": "botcha-verified",
+        "solve_time": 987,
+    }
+    token = jwt.encode(payload, secret, algorithm="HS256")
+    result = verify_botcha_token(token, secret)
+
+    assert result.valid is True
+    assert result.payload.solve_time == 987
+
+
+def test_verify_rejects_non_object_payload(secret):
+    """Test that a signed non-object payload is rejected as invalid."""
+    token = jwt.api_jws.encode(b"[1, 2, 3]", secret, algorithm="HS256")
+    result = verify_botcha_token(token, secret, use_cache=False)
+
+    assert result.valid is False
+    assert "payload" in result.error.lower()
+
+
+def test_verify_expired_token_skips_signature_check(expired_token, secret):
+    """Test that expired tokens are rejected before signature verification."""
+    with patch.object(verify_module, "_jwt_decode") as decode:
+        result = verify_botcha_token(expired_token, secret)
+
+    assert result.valid is False
+    assert "expired" in result.error.lower()
+    decode.assert_not_called()
+
+
+def test_peek_exp_ambiguous_payloads():
+    """Test that exp is only peeked when it appears exactly once."""
+    nested = jwt.encode(
+        {"meta": {"exp": 1}, "exp": 4102444800}, "k" * 32, algorithm="HS256"
+    )
+    assert verify_module._peek_exp(nested) is None
+
+    flat = jwt.encode({"exp": 4102444800}, "k" * 32, algorithm="HS256")
+    assert verify_module._peek_exp(flat) == 4102444800
+
+    assert verify_module._peek_exp("not-a-valid-jwt") is None
+    assert verify_module._peek_exp("a.!!!.c") is None
+
+
+def test_verify_alternating_secrets(valid_token, secret):
+    """Test that keyed HMAC reuse never mixes up secrets."""
+    other_token = jwt.encode(
+        jwt.decode(valid_token, options={"verify_signature": False}),
+        "another-secret-key-for-botcha",
+        algorithm="HS256",
+    )
+
+    for _ in range(3):
+        assert verify_botcha_token(valid_token, secret, use_cache=False).valid
+        assert verify_botcha_token(
+            other_token, "another-secret-key-for-botcha", use_cache=False
+        ).valid
+        assert not verify_botcha_token(other_token, secret, use_cache=False).valid
+
+
+@pytest.mark.skipif(
+    verify_module.jwt.__name__ != "jwt"
+    or tuple(int(part) for part in jwt.__version__.split(".")[:2]) < (2, 11),
+    reason="keyed HMAC is only registered on PyJWT >= 2.11",
+)
+def test_verify_registers_keyed_hmac(valid_token, secret):
+    """Test that the decoder uses keyed HMAC and reuses one template per secret."""
+    decoder = verify_module._jwt_decode.__self__
+    algorithm = decoder._jws._algorithms["HS256"]
+    assert isinstance(algorithm, verify_module._KeyedHMACAlgorithm)
+
+    algorithm._keyed.clear()
+    assert verify_botcha_token(valid_token, secret, use_cache=False).valid
+    assert len(algorithm._keyed) == 1
+    template = next(iter(algorithm._keyed.values()))
+
+    assert verify_botcha_token(valid_token, secret, use_cache=False).valid
+    assert len(algorithm._keyed) == 1
+    assert next(iter(algorithm._keyed.values())) is template
+
+
+def test_has_openssl_sha256():
+    """Test the SHA-256 backend diagnostic."""
+    assert isinstance(has_openssl_sha256(), bool)
+
+
+def test_verify_botcha_tokens_batch(valid_token, expired_token, secret):
+    """Test batch verification keeps order and verifies duplicates once."""
+    with patch.object(
+        verify_module, "_jwt_decode", wraps=verify_module._jwt_decode
+    ) as decode:
+        results = verify_botcha_tokens(
+            [valid_token, "not-a-valid-jwt", valid_token, expired_token],
+            secret,
+            use_cache=False,
+        )
+
+    assert [r.valid for r in results] == [True, False, True, False]
+    assert results[0] is results[2]
+    assert "expired" in results[3].error.lower()
+    # Expired token is rejected before decoding; the duplicate is not re-decoded
+    assert decode.call_count == 2
+
+
+def test_verify_botcha_tokens_empty(secret):
+    """Test batch verification of no tokens."""
+    assert verify_botcha_tokens([], secret) == []
+
+
+def test_verify_options_interned():
+    """Test that interned options are shared per (audience, client_ip)."""
+    first = VerifyOptions.interned(audience="https://api.example.com")
+    second = VerifyOptions.interned(audience="https://api.example.com")
+
+    assert first is second
+    assert first == VerifyOptions(audience="https://api.example.com")
+    assert VerifyOptions.interned(client_ip="10.0.0.1") is not first
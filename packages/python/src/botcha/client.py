@@ -1,16 +1,23 @@
 """BotchaClient - HTTP client for interacting with BOTCHA-protected endpoints."""
 
 import base64
+import binascii
+import importlib.util
 import json
+import re
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from urllib.parse import quote
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
 from botcha.solver import solve_botcha
 from botcha.types import (
-    ChallengeResponse,
     CreateAppResponse,
     RecoverAccountResponse,
     ResendVerificationResponse,
@@ -18,11 +25,83 @@ from botcha.types import (
     TAPAgentListResponse,
     TAPAgentResponse,
     TAPSessionResponse,
-    TokenResponse,
     VerifyEmailResponse,
 )
 
 
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# HTTP/2 lets token, verify and retried requests share one connection; httpx
+# only supports it when the optional h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a compact JSON request body with the stdlib encoder."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _fast_json_dumps(obj: Any) -> bytes:
+    """
+    Encode a compact JSON body, using orjson when installed.
+
+    Only for the client's own fixed-shape payloads (token verify/refresh,
+    challenge answers): orjson rejects input the stdlib encoder accepts, such
+    as non-str dict keys or integers beyond 64 bits, so caller-supplied bodies
+    go through _json_dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _json_dumps(obj)
+
+
+_B64_PAD = "==="
+_b64urldec = base64.urlsafe_b64decode
+
+# Matches the exp claim in a decoded JWT payload
+_EXP_RE = re.compile(rb'"exp"\s*:\s*(\d+(?:\.\d+)?)')
+
+
+def _extract_exp(token: str) -> Optional[float]:
+    """
+    Read the ``exp`` claim from a JWT without verifying or JSON-parsing it.
+
+    Args:
+        token: JWT string (header.payload.signature)
+
+    Returns:
+        Expiry timestamp, or None if the token has no single readable exp claim
+    """
+    # JWT structure: header.payload.signature
+    start = token.find(".") + 1
+    if start == 0:
+        return None
+    end = token.find(".", start)
+    if end < 0:
+        end = len(token)
+
+    payload_b64 = token[start:end]
+    # Add padding for proper base64 decoding
+    payload_b64 += _B64_PAD[: -len(payload_b64) & 3]
+    try:
+        payload_bytes = _b64urldec(payload_b64)
+    except (binascii.Error, ValueError):
+        return None
+
+    matches = _EXP_RE.findall(payload_bytes)
+    if len(matches) != 1:
+        return None
+    return float(matches[0])
+
+
 class BotchaClient:
     """
     HTTP client with automatic BOTCHA challenge solving and JWT token management.
@@ -48,6 +127,8 @@ class BotchaClient:
         auto_token: bool = True,
         audience: Optional[str] = None,
         app_id: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize the BotchaClient.
@@ -59,8 +140,20 @@ class BotchaClient:
             auto_token: Automatically acquire and attach Bearer tokens (default: True)
             audience: Optional audience claim for token verification
             app_id: Optional multi-tenant application ID
+            transport: Optional httpx transport, e.g. ``httpx.MockTransport`` in
+                tests (replaces the default HTTP/2-capable connection pool)
+            http_client: Optional pre-built ``httpx.AsyncClient`` to send requests
+                through, so several BotchaClients can share one connection pool.
+                Its own headers, timeout and transport are used as-is, and
+                close() leaves it open for the caller to close.
+
+        Raises:
+            ValueError: If both transport and http_client are given.
         """
-        self.base_url = base_url.rstrip("/")
+        if transport is not None and http_client is not None:
+            raise ValueError("Pass either transport or http_client, not both.")
+
+        self.base_url = base_url
         self.agent_identity = agent_identity
         self.max_retries = max_retries
         self.auto_token = auto_token
@@ -68,15 +161,86 @@ class BotchaClient:
         self.app_id = app_id
 
         self._token: Optional[str] = None
-        self._token_expires_at: float = 0
+        # Expiry on the monotonic clock so wall-clock jumps can't skew it
+        self._token_monotonic_expires_at: float = 0
         self._refresh_token: Optional[str] = None
 
-        # Create httpx AsyncClient with custom headers
-        headers = {}
-        if agent_identity:
-            headers["User-Agent"] = agent_identity
+        # close() only closes the HTTP client when this instance created it
+        self._owns_client = http_client is None
+        if http_client is not None:
+            self._client = http_client
+        else:
+            # Create httpx AsyncClient with custom headers
+            headers = {}
+            if agent_identity:
+                headers["User-Agent"] = agent_identity
+
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=30.0,
+                http2=_HTTP2_AVAILABLE,
+                limits=_POOL_LIMITS,
+                transport=transport,
+            )
 
-        self._client = httpx.AsyncClient(headers=headers, timeout=30.0)
+    @property
+    def base_url(self) -> str:
+        """Base URL for the BOTCHA service, without a trailing slash."""
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        self._base_url = value.rstrip("/")
+        # Precompute the fixed endpoint URLs used on every token round trip
+        self._url_token = f"{self._base_url}/v1/token"
+        self._url_verify = f"{self._base_url}/v1/token/verify"
+        self._url_refresh = f"{self._base_url}/v1/token/refresh"
+        self._url_apps = f"{self._base_url}/v1/apps"
+        self._url_recover = f"{self._base_url}/v1/auth/recover"
+        self._url_register_tap = f"{self._base_url}/v1/agents/register/tap"
+
+    @property
+    def audience(self) -> Optional[str]:
+        """Audience claim requested for acquired tokens, if any."""
+        return self._audience
+
+    @audience.setter
+    def audience(self, value: Optional[str]) -> None:
+        self._audience = value
+        # Spread into the verify payload so get_token needn't branch per call
+        self._verify_audience = {"audience": value} if value else {}
+
+    @property
+    def app_id(self) -> Optional[str]:
+        """Multi-tenant application ID attached to requests, if any."""
+        return self._app_id
+
+    @app_id.setter
+    def app_id(self, value: Optional[str]) -> None:
+        self._app_id = value
+        # app_id rarely changes, so URL-encode it once here rather than per call
+        self._app_id_quoted = quote(value, safe="") if value else None
+        self._verify_app_id = {"app_id": value} if value else {}
+        self._app_id_query = f"?app_id={self._app_id_quoted}" if value else ""
+
+    def _quoted_aid(self, app_id: Optional[str]) -> str:
+        """
+        Return the URL-encoded app ID for a path segment.
+
+        Args:
+            app_id: Explicit app ID, or None to use the client's app_id
+
+        Returns:
+            URL-encoded app ID
+
+        Raises:
+            ValueError: If no app_id is available
+        """
+        if app_id:
+            return quote(app_id, safe="")
+        if self._app_id_quoted is None:
+            raise ValueError("No app ID. Call create_app() first or pass app_id.")
+        return self._app_id_quoted
 
     def solve(self, problems: list[int]) -> list[str]:
         """
@@ -109,51 +273,43 @@ class BotchaClient:
             httpx.HTTPError: If token acquisition fails
         """
         # Check if cached token is still valid (>5min before expiry)
-        now = time.time()
-        if self._token and self._token_expires_at > (now + 300):  # 300s = 5min buffer
-            return self._token
+        now = time.monotonic()
+        token = self._token
+        if token and self._token_monotonic_expires_at > now + 300:
+            return token
 
         # Step 1: Get challenge
-        token_url = f"{self.base_url}/v1/token"
-        if self.app_id:
-            token_url += f"?app_id={self.app_id}"
-        challenge_response = await self._client.get(token_url)
-        challenge_response.raise_for_status()
-        challenge_data = challenge_response.json()
-
-        # Parse challenge
-        challenge = ChallengeResponse(
-            id=challenge_data["id"],
-            problems=challenge_data["problems"],
-            time_limit=challenge_data["timeLimit"],
+        challenge_response = await self._client.get(
+            self._url_token + self._app_id_query
         )
+        # Only call raise_for_status off the (common) 2xx path
+        if challenge_response.status_code >= 300:
+            challenge_response.raise_for_status()
+        challenge_data = _json_loads(challenge_response.content)
 
-        # Step 2: Solve challenge
-        solutions = self.solve(challenge.problems)
+        # Step 2: Solve challenge (read the dict directly; ChallengeResponse is
+        # only for callers who want a typed view)
+        solutions = self.solve(challenge_data["problems"])
 
         # Step 3: Verify and get token
-        verify_payload = {"id": challenge.id, "answers": solutions}
-        if self.audience:
-            verify_payload["audience"] = self.audience
-        if self.app_id:
-            verify_payload["app_id"] = self.app_id
+        verify_payload = {
+            "id": challenge_data["id"],
+            "answers": solutions,
+            **self._verify_audience,
+            **self._verify_app_id,
+        }
 
-        verify_response = await self._client.post(
-            f"{self.base_url}/v1/token/verify",
-            json=verify_payload,
-        )
-        verify_response.raise_for_status()
-        verify_data = verify_response.json()
-
-        # Parse token response
-        token_response = TokenResponse(
-            verified=verify_data["verified"],
-            token=verify_data["token"],
-            solve_time_ms=verify_data["solveTimeMs"],
+        verify_response = await self._post_json(
+            self._url_verify,
+            verify_payload,
+            encode=_fast_json_dumps,
         )
+        if verify_response.status_code >= 300:
+            verify_response.raise_for_status()
+        verify_data = _json_loads(verify_response.content)
 
         # Cache the access token
-        self._token = token_response.token
+        self._token = verify_data["token"]
 
         # Store refresh token if provided
         if "refresh_token" in verify_data:
@@ -161,35 +317,13 @@ class BotchaClient:
 
         # Set token expiry from expires_in (5 minutes = 300 seconds)
         if "expires_in" in verify_data:
-            self._token_expires_at = now + verify_data["expires_in"]
+            self._token_monotonic_expires_at = now + verify_data["expires_in"]
         else:
-            # Fallback: Parse expiry from JWT payload
-            try:
-                # JWT structure: header.payload.signature
-                parts = token_response.token.split(".")
-                if len(parts) >= 2:
-                    # Decode payload (add padding if needed)
-                    payload_b64 = parts[1]
-                    # Add padding for proper base64 decoding
-                    padding = 4 - (len(payload_b64) % 4)
-                    if padding != 4:
-                        payload_b64 += "=" * padding
-
-                    payload_bytes = base64.urlsafe_b64decode(payload_b64)
-                    payload = json.loads(payload_bytes)
-
-                    # Extract expiry timestamp
-                    if "exp" in payload:
-                        self._token_expires_at = float(payload["exp"])
-                    else:
-                        # Default to 5 minutes from now if no exp field
-                        self._token_expires_at = now + 300
-                else:
-                    # Invalid JWT format, default to 5 minutes
-                    self._token_expires_at = now + 300
-            except Exception:
-                # Failed to parse JWT, default to 5 minutes expiry
-                self._token_expires_at = now + 300
+            # Fallback: Parse expiry from JWT payload, default to 5 minutes.
+            # exp is wall-clock, so convert it to a remaining lifetime.
+            exp = _extract_exp(self._token)
+            ttl = exp - time.time() if exp is not None else 300
+            self._token_monotonic_expires_at = now + ttl
 
         return self._token
 
@@ -212,26 +346,79 @@ class BotchaClient:
             raise ValueError("No refresh token available")
 
         # Call refresh endpoint
-        refresh_response = await self._client.post(
-            f"{self.base_url}/v1/token/refresh",
-            json={"refresh_token": self._refresh_token},
+        refresh_response = await self._post_json(
+            self._url_refresh,
+            {"refresh_token": self._refresh_token},
+            encode=_fast_json_dumps,
         )
-        refresh_response.raise_for_status()
-        refresh_data = refresh_response.json()
+        if refresh_response.status_code >= 300:
+            refresh_response.raise_for_status()
+        refresh_data = _json_loads(refresh_response.content)
 
         # Update access token
         self._token = refresh_data["access_token"]
 
         # Update expiry time
-        now = time.time()
+        now = time.monotonic()
         if "expires_in" in refresh_data:
-            self._token_expires_at = now + refresh_data["expires_in"]
+            self._token_monotonic_expires_at = now + refresh_data["expires_in"]
         else:
             # Default to 5 minutes if not provided
-            self._token_expires_at = now + 300
+            self._token_monotonic_expires_at = now + 300
 
         return self._token
 
+    async def _post_json(
+        self,
+        url: str,
+        payload: Any,
+        headers: Optional[dict[str, str]] = None,
+        encode: Callable[[Any], bytes] = _json_dumps,
+    ) -> httpx.Response:
+        """
+        POST a compact JSON body.
+
+        Args:
+            url: URL to post to
+            payload: JSON-serializable request body
+            headers: Optional extra request headers
+            encode: Body encoder; _fast_json_dumps for the client's own
+                fixed-shape payloads, the stdlib encoder otherwise
+
+        Returns:
+            httpx.Response object
+        """
+        headers = {**headers, **_JSON_CONTENT_TYPE} if headers else _JSON_CONTENT_TYPE
+        return await self._client.post(url, content=encode(payload), headers=headers)
+
+    async def _refreshed_token(self) -> Optional[str]:
+        """
+        Refresh the access token for a 401 retry.
+
+        Returns:
+            New access token, or None if there is no refresh token or the
+            refresh failed
+        """
+        if not self._refresh_token:
+            return None
+        try:
+            return await self.refresh_token()
+        except Exception:
+            # Refresh failed, fall through to full re-verify
+            return None
+
+    async def _fresh_token(self) -> str:
+        """
+        Clear cached tokens and acquire a new one via the challenge flow.
+
+        Returns:
+            New access token
+        """
+        self._token = None
+        self._token_monotonic_expires_at = 0
+        self._refresh_token = None
+        return await self.get_token()
+
     async def fetch(self, url: str, **kwargs: Any) -> httpx.Response:
         """
         Make an HTTP request with automatic BOTCHA handling.
@@ -251,70 +438,59 @@ class BotchaClient:
         Raises:
             httpx.HTTPError: If request fails after retries
         """
-        # Prepare headers
+        # One headers dict and bound request method are reused for every attempt
         headers = kwargs.pop("headers", {})
+        request = self._client.request
 
-        # Auto-attach token if enabled
-        if self.auto_token:
-            token = await self.get_token()
-            headers["Authorization"] = f"Bearer {token}"
-
-        # Make request
-        kwargs["headers"] = headers
-        response = await self._client.request("GET", url, **kwargs)
-
-        # Handle 401 - token expired, try refresh first, then full re-verify
-        if response.status_code == 401 and self.auto_token:
-            # Try refresh token first if available
-            if self._refresh_token:
-                try:
-                    token = await self.refresh_token()
-                    headers["Authorization"] = f"Bearer {token}"
-                    kwargs["headers"] = headers
-
-                    # Retry request with refreshed token
-                    response = await self._client.request("GET", url, **kwargs)
-
-                    # If still 401, fall through to full re-verify
-                    if response.status_code != 401:
-                        return response
-                except Exception:
-                    # Refresh failed, fall through to full re-verify
-                    pass
-
-            # Clear cached tokens and get fresh token via challenge
-            self._token = None
-            self._token_expires_at = 0
-            self._refresh_token = None
-
-            # Get fresh token
-            token = await self.get_token()
-            headers["Authorization"] = f"Bearer {token}"
-            kwargs["headers"] = headers
-
-            # Retry request
-            response = await self._client.request("GET", url, **kwargs)
-
-        # Handle 403 - inline challenge
-        if response.status_code == 403:
+        if not self.auto_token:
+            response = await request("GET", url, headers=headers, **kwargs)
+        else:
+            # On 401, try the refresh token first, then a full re-verify
+            for acquire_token in (
+                self.get_token,
+                self._refreshed_token,
+                self._fresh_token,
+            ):
+                token = await acquire_token()
+                if token is None:
+                    continue
+                headers["Authorization"] = f"Bearer {token}"
+                response = await request("GET", url, headers=headers, **kwargs)
+                if response.status_code != 401:
+                    break
+
+        # Handle 403 - inline challenge (only JSON bodies can carry one)
+        if (
+            response.status_code == 403
+            and response.content
+            and response.headers.get("content-type", "").startswith(
+                "application/json"
+            )
+        ):
             try:
-                body = response.json()
-                if "challenge" in body and "problems" in body["challenge"]:
-                    # Solve inline challenge
-                    challenge = body["challenge"]
-                    solutions = self.solve(challenge["problems"])
-
-                    # Retry with challenge headers
-                    headers["X-Botcha-Challenge-Id"] = challenge["id"]
-                    headers["X-Botcha-Answers"] = json.dumps(solutions)
-                    if self.app_id:
-                        headers["X-Botcha-App-Id"] = self.app_id
-                    kwargs["headers"] = headers
-
-                    response = await self._client.request("GET", url, **kwargs)
-            except (json.JSONDecodeError, KeyError):
-                # Not a BOTCHA challenge, return original response
-                pass
+                body = _json_loads(response.content)
+            except json.JSONDecodeError:
+                body = None
+
+            # Anything without a challenge id and problems is not a BOTCHA
+            # challenge, so the original response is returned
+            challenge = body.get("challenge") if isinstance(body, dict) else None
+            if (
+                isinstance(challenge, dict)
+                and "id" in challenge
+                and "problems" in challenge
+            ):
+                # Solve inline challenge
+                solutions = self.solve(challenge["problems"])
+
+                # Retry with challenge headers
+                headers["X-Botcha-Challenge-Id"] = challenge["id"]
+                headers["X-Botcha-Answers"] = _fast_json_dumps(solutions).decode()
+                app_id = self.app_id
+                if app_id:
+                    headers["X-Botcha-App-Id"] = app_id
+
+                response = await request("GET", url, headers=headers, **kwargs)
 
         return response
 
@@ -342,12 +518,12 @@ class BotchaClient:
             print(app.app_id)      # 'app_abc123'
             print(app.app_secret)  # 'sk_...' (save this!)
         """
-        response = await self._client.post(
-            f"{self.base_url}/v1/apps",
-            json={"email": email},
+        response = await self._post_json(
+            self._url_apps,
+            {"email": email},
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         # Auto-set app_id for subsequent requests
         if "app_id" in data:
@@ -384,16 +560,14 @@ class BotchaClient:
             ValueError: If no app_id is available.
             httpx.HTTPStatusError: If verification fails.
         """
-        aid = app_id or self.app_id
-        if not aid:
-            raise ValueError("No app ID. Call create_app() first or pass app_id.")
+        aid = self._quoted_aid(app_id)
 
-        response = await self._client.post(
-            f"{self.base_url}/v1/apps/{quote(aid, safe='')}/verify-email",
-            json={"code": code},
+        response = await self._post_json(
+            f"{self._url_apps}/{aid}/verify-email",
+            {"code": code},
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return VerifyEmailResponse(
             success=data.get("success", False),
@@ -418,15 +592,13 @@ class BotchaClient:
             ValueError: If no app_id is available.
             httpx.HTTPStatusError: If resend fails.
         """
-        aid = app_id or self.app_id
-        if not aid:
-            raise ValueError("No app ID. Call create_app() first or pass app_id.")
+        aid = self._quoted_aid(app_id)
 
         response = await self._client.post(
-            f"{self.base_url}/v1/apps/{quote(aid, safe='')}/resend-verification",
+            f"{self._url_apps}/{aid}/resend-verification",
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return ResendVerificationResponse(
             success=data.get("success", False),
@@ -450,12 +622,12 @@ class BotchaClient:
         Raises:
             httpx.HTTPStatusError: If the request fails.
         """
-        response = await self._client.post(
-            f"{self.base_url}/v1/auth/recover",
-            json={"email": email},
+        response = await self._post_json(
+            self._url_recover,
+            {"email": email},
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return RecoverAccountResponse(
             success=data.get("success", False),
@@ -478,20 +650,18 @@ class BotchaClient:
             ValueError: If no app_id is available.
             httpx.HTTPStatusError: If rotation fails or auth is missing.
         """
-        aid = app_id or self.app_id
-        if not aid:
-            raise ValueError("No app ID. Call create_app() first or pass app_id.")
+        aid = self._quoted_aid(app_id)
 
         headers: dict[str, str] = {}
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
         response = await self._client.post(
-            f"{self.base_url}/v1/apps/{quote(aid, safe='')}/rotate-secret",
+            f"{self._url_apps}/{aid}/rotate-secret",
             headers=headers,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return RotateSecretResponse(
             success=data.get("success", False),
@@ -545,9 +715,7 @@ class BotchaClient:
             )
             print(agent.agent_id)
         """
-        url = f"{self.base_url}/v1/agents/register/tap"
-        if self.app_id:
-            url += f"?app_id={self.app_id}"
+        url = self._url_register_tap + self._app_id_query
 
         payload: dict = {"name": name}
         if operator is not None:
@@ -569,9 +737,9 @@ class BotchaClient:
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        response = await self._client.post(url, json=payload, headers=headers)
+        response = await self._post_json(url, payload, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return TAPAgentResponse(
             success=data.get("success", False),
@@ -607,7 +775,7 @@ class BotchaClient:
             f"{self.base_url}/v1/agents/{quote(agent_id, safe='')}/tap"
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return TAPAgentResponse(
             success=data.get("success", False),
@@ -654,7 +822,7 @@ class BotchaClient:
 
         response = await self._client.get(url, params=params, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return TAPAgentListResponse(
             success=data.get("success", False),
@@ -692,16 +860,16 @@ class BotchaClient:
             )
             print(session.session_id, session.expires_at)
         """
-        response = await self._client.post(
+        response = await self._post_json(
             f"{self.base_url}/v1/sessions/tap",
-            json={
+            {
                 "agent_id": agent_id,
                 "user_context": user_context,
                 "intent": intent,
             },
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return TAPSessionResponse(
             success=data.get("success", False),
@@ -729,7 +897,7 @@ class BotchaClient:
             f"{self.base_url}/v1/sessions/{quote(session_id, safe='')}/tap"
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         return TAPSessionResponse(
             success=data.get("success", False),
@@ -765,7 +933,7 @@ class BotchaClient:
             f"{self.base_url}/.well-known/jwks", params=params
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     async def get_key_by_id(self, key_id: str) -> dict:
         """Get a specific public key by key ID.
@@ -780,7 +948,7 @@ class BotchaClient:
             f"{self.base_url}/v1/keys/{quote(key_id, safe='')}"
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     async def rotate_agent_key(
         self,
@@ -811,13 +979,13 @@ class BotchaClient:
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        response = await self._client.post(
+        response = await self._post_json(
             f"{self.base_url}/v1/agents/{quote(agent_id, safe='')}/tap/rotate-key",
-            json=body,
+            body,
             headers=headers,
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     # ============ INVOICE & PAYMENT (402 Flow) ============
 
@@ -858,11 +1026,11 @@ class BotchaClient:
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        response = await self._client.post(
-            f"{self.base_url}/v1/invoices", json=body, headers=headers
+        response = await self._post_json(
+            f"{self.base_url}/v1/invoices", body, headers=headers
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     async def get_invoice(self, invoice_id: str) -> dict:
         """Get an invoice by ID.
@@ -877,7 +1045,7 @@ class BotchaClient:
             f"{self.base_url}/v1/invoices/{quote(invoice_id, safe='')}"
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     async def verify_browsing_iou(self, invoice_id: str, iou: dict) -> dict:
         """Verify a Browsing IOU against an invoice.
@@ -889,19 +1057,23 @@ class BotchaClient:
         Returns:
             Verification result with access_token if successful
         """
-        response = await self._client.post(
+        response = await self._post_json(
             f"{self.base_url}/v1/invoices/{quote(invoice_id, safe='')}/verify-iou",
-            json=iou,
+            iou,
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     async def close(self) -> None:
-        """Close the underlying HTTP client and clear cached tokens."""
+        """Close the underlying HTTP client and clear cached tokens.
+
+        An http_client passed to the constructor is left open.
+        """
         self._token = None
-        self._token_expires_at = 0
+        self._token_monotonic_expires_at = 0
         self._refresh_token = None
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def __aenter__(self) -> "BotchaClient":
         """Async context manager entry."""
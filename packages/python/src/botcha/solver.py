@@ -1,16 +1,26 @@
 """BOTCHA speed challenge solver implementation."""
 
-import hashlib
+from functools import lru_cache
+from hashlib import sha256
+from typing import Iterable
 
 
-def solve_botcha(problems: list[int]) -> list[str]:
+@lru_cache(maxsize=4096, typed=True)
+def _solve_one(problem: int) -> str:
+    """Return the first 8 hex characters of SHA256 of a problem number."""
+    # Hex-encode only the 4 digest bytes we need rather than all 32
+    return sha256(str(problem).encode()).digest()[:4].hex()
+
+
+def solve_botcha(problems: Iterable[int]) -> list[str]:
     """
     Solve BOTCHA speed challenge problems.
 
     For each problem number, compute SHA256 hash and return first 8 hex characters.
 
     Args:
-        problems: List of 6-digit integers to solve
+        problems: 6-digit integers to solve; any iterable is consumed once,
+            so callers never need to copy into a list first
 
     Returns:
         List of 8-character hex strings (SHA256 hash prefixes)
@@ -19,11 +29,8 @@ def solve_botcha(problems: list[int]) -> list[str]:
         >>> solve_botcha([123456])
         ['8d969eef']
     """
-    solutions = []
-    for num in problems:
-        # Convert number to string, compute SHA256 hash
-        hash_obj = hashlib.sha256(str(num).encode())
-        hash_hex = hash_obj.hexdigest()
-        # Return first 8 characters
-        solutions.append(hash_hex[:8])
-    return solutions
+    # Deliberately serial: each input is a single SHA-256 block and hashlib only
+    # releases the GIL for inputs over 2 KiB, so threads would add overhead.
+    # Answers are memoized so repeated problems (e.g. a reissued inline
+    # challenge) skip hashing
+    return [_solve_one(num) for num in problems]
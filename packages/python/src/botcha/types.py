@@ -1,10 +1,14 @@
 """Type definitions for BOTCHA SDK."""
 
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Union
 
+# dataclass(slots=...) needs Python 3.10+; 3.9 falls back to regular instances
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class ChallengeResponse:
     """Response from the /challenge endpoint."""
 
@@ -13,7 +17,7 @@ class ChallengeResponse:
     time_limit: int
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TokenResponse:
     """Response from the /solve endpoint."""
 
@@ -22,7 +26,7 @@ class TokenResponse:
     solve_time_ms: float
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class VerifyResponse:
     """Response from the /verify endpoint."""
 
@@ -34,7 +38,7 @@ class VerifyResponse:
 # ============ App Management Types ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CreateAppResponse:
     """Response from POST /v1/apps."""
 
@@ -51,7 +55,7 @@ class CreateAppResponse:
     next_step: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class VerifyEmailResponse:
     """Response from POST /v1/apps/:id/verify-email."""
 
@@ -61,7 +65,7 @@ class VerifyEmailResponse:
     message: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ResendVerificationResponse:
     """Response from POST /v1/apps/:id/resend-verification."""
 
@@ -70,7 +74,7 @@ class ResendVerificationResponse:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class RecoverAccountResponse:
     """Response from POST /v1/auth/recover."""
 
@@ -78,7 +82,7 @@ class RecoverAccountResponse:
     message: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class RotateSecretResponse:
     """Response from POST /v1/apps/:id/rotate-secret."""
 
@@ -94,7 +98,7 @@ class RotateSecretResponse:
 # ============ TAP (Trusted Agent Protocol) Types ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TAPCapability:
     """TAP capability defining what actions an agent can perform."""
 
@@ -103,7 +107,7 @@ class TAPCapability:
     restrictions: Optional[dict] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TAPIntent:
     """TAP intent declaring what an agent wants to do."""
 
@@ -113,7 +117,7 @@ class TAPIntent:
     duration: Optional[int] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TAPAgentResponse:
     """Response from TAP agent registration or retrieval."""
 
@@ -135,7 +139,7 @@ class TAPAgentResponse:
     public_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TAPAgentListResponse:
     """Response from listing TAP agents."""
 
@@ -145,7 +149,7 @@ class TAPAgentListResponse:
     tap_enabled_count: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TAPSessionResponse:
     """Response from TAP session creation or retrieval."""
 
@@ -163,7 +167,7 @@ class TAPSessionResponse:
 # ============ JWK / JWKS Types ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class JWK:
     """JSON Web Key"""
 
@@ -181,7 +185,7 @@ class JWK:
     expires_at: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class JWKSet:
     """JSON Web Key Set"""
 
@@ -191,7 +195,7 @@ class JWKSet:
 # ============ Agentic Consumer Recognition Types ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ContextualData:
     """Consumer contextual data (TAP Layer 2)"""
 
@@ -201,7 +205,7 @@ class ContextualData:
     device_data: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class IDTokenClaims:
     """OIDC ID Token claims"""
 
@@ -221,7 +225,7 @@ class IDTokenClaims:
     email_mask: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class AgenticConsumerResult:
     """Result from agentic consumer verification"""
 
@@ -237,7 +241,7 @@ class AgenticConsumerResult:
 # ============ Agentic Payment Types ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CardMetadata:
     """Card metadata from Agentic Payment Container"""
 
@@ -247,7 +251,7 @@ class CardMetadata:
     card_data: Optional[List[Dict[str, Any]]] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CredentialHash:
     """Credential hash for payment verification"""
 
@@ -255,7 +259,7 @@ class CredentialHash:
     algorithm: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class BrowsingIOU:
     """Browsing IOU for 402 micropayment flow"""
 
@@ -274,7 +278,7 @@ class BrowsingIOU:
 # ============ Invoice Types (402 Flow) ============
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class InvoiceResponse:
     """Invoice details for 402 flow"""
 
@@ -291,7 +295,7 @@ class InvoiceResponse:
     status: str = "pending"
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class VerifyIOUResponse:
     """IOU verification result"""
 
@@ -0,0 +1,41 @@
+"""Shared fixtures for BOTCHA SDK tests."""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+import botcha.client
+from botcha.client import BotchaClient
+
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_client():
+    """Default BotchaClient built once per test session (per xdist worker)."""
+    async with BotchaClient() as client:
+        yield client
+
+
+@pytest.fixture
+def client(shared_client):
+    """The session's shared BotchaClient with per-test state cleared."""
+    shared_client.base_url = "https://botcha.ai"
+    # create_app() stores the new app_id on the client
+    shared_client.app_id = None
+    shared_client._token = None
+    shared_client._token_monotonic_expires_at = 0
+    shared_client._refresh_token = None
+    return shared_client
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Freeze the wall and monotonic clocks seen by botcha.client.
+
+    Returns:
+        The patched clock, whose time() and monotonic() stay fixed so expiry
+        math can be asserted exactly
+    """
+    clock = SimpleNamespace(time=lambda: 1_700_000_000.0, monotonic=lambda: 1_000.0)
+    monkeypatch.setattr(botcha.client, "time", clock)
+    return clock
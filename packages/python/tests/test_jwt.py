@@ -0,0 +1,30 @@
+"""Tests for JWT expiry parsing."""
+
+import base64
+
+from botcha.client import _extract_exp
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def test_extract_exp_reads_claim():
+    """Test that exp is read from the JWT payload."""
+    payload_b64 = _b64(b'{"sub": "test", "exp": 1700000000}')
+    assert _extract_exp(f"header.{payload_b64}.sig") == 1700000000.0
+
+
+def test_extract_exp_compact_json():
+    """Test that exp is read from compact (no-whitespace) JSON payloads."""
+    payload_b64 = _b64(b'{"sub":"test","exp":1700000123}')
+    assert _extract_exp(f"header.{payload_b64}.sig") == 1700000123.0
+
+
+def test_extract_exp_unreadable_tokens():
+    """Test that malformed tokens or payloads without exp return None."""
+    no_exp = _b64(b'{"sub":"test"}')
+
+    assert _extract_exp("not-a-jwt") is None
+    assert _extract_exp("not.a.valid.jwt") is None
+    assert _extract_exp(f"header.{no_exp}.sig") is None
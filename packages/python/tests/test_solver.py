@@ -1,7 +1,7 @@
 """Tests for BOTCHA solver implementation."""
 
 import re
-from botcha.solver import solve_botcha
+from botcha.solver import _solve_one, solve_botcha
 
 
 def test_solve_botcha_known_values():
@@ -74,3 +74,17 @@ def test_solve_botcha_different_inputs():
     result1 = solve_botcha([123456])
     result2 = solve_botcha([123457])
     assert result1 != result2
+
+
+def test_solve_botcha_accepts_any_iterable():
+    """Test that tuples and generators are solved without list conversion."""
+    expected = ["8d969eef", "937377f0"]
+    assert solve_botcha((123456, 999999)) == expected
+    assert solve_botcha(n for n in [123456, 999999]) == expected
+
+
+def test_solve_botcha_memoizes_repeated_problems():
+    """Test that repeated problems are served from the answer cache."""
+    _solve_one.cache_clear()
+    assert solve_botcha([123456, 123456]) == ["8d969eef", "8d969eef"]
+    assert _solve_one.cache_info().hits == 1